@@ -22,6 +22,9 @@ import hashlib
 import html as html_module
 import json
 import os
+import pickle
+import queue
+import sqlite3
 import platform
 import subprocess
 import sys
@@ -29,17 +32,36 @@ import threading
 import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field, asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+try:
+    from rapidfuzz.distance import Indel as _Indel
+except ImportError:
+    _Indel = None
+
+try:
+    from diff_match_patch import diff_match_patch as _DiffMatchPatch
+except ImportError:
+    _DiffMatchPatch = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS
 # ══════════════════════════════════════════════════════════════════════════════
 
-DEFAULT_EXTENSIONS = {
+# Frozen: shared by every scan worker, never mutated. Membership via the
+# rpartition'd suffix is one O(1) hash probe per file, versus a linear
+# endswith sweep over a tuple of 18 patterns.
+DEFAULT_EXTENSIONS = frozenset({
     ".h", ".hpp", ".hxx",
     ".c", ".cpp", ".cxx", ".cc",
     ".inl", ".inc",
@@ -49,19 +71,27 @@ DEFAULT_EXTENSIONS = {
     ".xml", ".json",
     ".ini", ".cfg",
     ".uproject", ".uplugin",
-}
+})
 
 COMPOUND_EXTENSIONS = (".build.cs", ".target.cs")
 
 APP_NAME = "UE Source Diff Tool"
 VERSION = "1.0.0"
 
+# Above this many lines, difflib's pure-Python SequenceMatcher becomes the
+# bottleneck and the diff-match-patch backend (if installed) takes over.
+DMP_LINE_THRESHOLD = 5000
+
+# Sidecar content-hash cache so re-runs only read files that changed.
+CACHE_DIR = Path.home() / ".cache" / "ue_source_diff"
+CACHE_DB = CACHE_DIR / "cache.sqlite"
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # DATA STRUCTURES
 # ══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class FileDiff:
     relative_path: str
     status: str
@@ -71,69 +101,357 @@ class FileDiff:
     lines_removed: int = 0
     diff: list = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        # Flat literal instead of dataclasses.asdict, which recurses into and
+        # deep-copies the diff list just so json can walk it.
+        return {
+            "relative_path": self.relative_path,
+            "status": self.status,
+            "location_a": self.location_a,
+            "location_b": self.location_b,
+            "lines_added": self.lines_added,
+            "lines_removed": self.lines_removed,
+            "diff": self.diff,
+        }
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # COMPARISON ENGINE
 # ══════════════════════════════════════════════════════════════════════════════
 
-def fast_hash(filepath: str) -> str:
-    h = hashlib.md5()
+@lru_cache(maxsize=64)
+def _read_bytes_cached(filepath: str, mtime_ns: int, size: int) -> bytes:
+    # The size is already known from the scan, so read via raw os.open/os.read
+    # with no BufferedReader, no fstat probe and (usually) a single read call.
     try:
-        with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(1 << 16), b""):
-                h.update(chunk)
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
     except OSError:
-        return ""
-    return h.hexdigest()
+        return b""
+    try:
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    except OSError:
+        return b""
+    finally:
+        os.close(fd)
+
+
+def read_file_bytes(filepath: str) -> bytes:
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return b""
+    return _read_bytes_cached(filepath, st.st_mtime_ns, st.st_size)
+
 
+def _cache_connect(check_same_thread: bool = True) -> sqlite3.Connection:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(CACHE_DB, check_same_thread=check_same_thread)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS file_hashes ("
+        "abs_path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT)"
+    )
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS diff_results ("
+        "rel_path TEXT, mtime_a INTEGER, size_a INTEGER,"
+        " mtime_b INTEGER, size_b INTEGER, ctx INTEGER, result BLOB,"
+        " PRIMARY KEY (rel_path, mtime_a, size_a, mtime_b, size_b, ctx))"
+    )
+    return con
 
-def read_lines(filepath: str) -> list:
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
+
+def load_hash_cache() -> dict:
+    """abs_path -> (mtime_ns, size, digest) from the sidecar cache DB."""
+    try:
+        con = _cache_connect()
         try:
-            with open(filepath, "r", encoding=enc, errors="replace") as f:
-                return f.readlines()
-        except Exception:
-            continue
-    return []
+            return {p: (m, s, d) for p, m, s, d in con.execute(
+                "SELECT abs_path, mtime_ns, size, digest FROM file_hashes")}
+        finally:
+            con.close()
+    except sqlite3.Error:
+        return {}
 
 
-def collect_source_files(root: str, extensions: set) -> dict:
-    result = {}
+def store_hash_cache(rows: list):
+    if not rows:
+        return
+    try:
+        con = _cache_connect()
+        try:
+            with con:
+                con.executemany(
+                    "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)", rows)
+        finally:
+            con.close()
+    except sqlite3.Error:
+        pass
+
+
+def load_diff_result(con: sqlite3.Connection, key: tuple):
+    """Look up a cached diff result for (rel_path, stats, ctx).
+
+    Returns (hit, FileDiff-or-None): a hit with None means the pair was
+    diffed before and found equal, which is worth remembering too.
+    """
+    try:
+        row = con.execute(
+            "SELECT result FROM diff_results WHERE rel_path=? AND mtime_a=?"
+            " AND size_a=? AND mtime_b=? AND size_b=? AND ctx=?", key).fetchone()
+    except sqlite3.Error:
+        return False, None
+    if row is None:
+        return False, None
+    try:
+        return True, pickle.loads(row[0])
+    except Exception:
+        return False, None
+
+
+def store_diff_results(rows: list):
+    """rows: (rel_path, mtime_a, size_a, mtime_b, size_b, ctx, pickled blob)."""
+    if not rows:
+        return
+    try:
+        con = _cache_connect()
+        try:
+            with con:
+                con.executemany(
+                    "INSERT OR REPLACE INTO diff_results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        finally:
+            con.close()
+    except sqlite3.Error:
+        pass
+
+
+def decode_lines(data: bytes) -> tuple:
+    """Decode file bytes as UTF-8 (BOM stripped), replacing invalid sequences.
+
+    UE source is effectively all UTF-8; with errors="replace" the decode
+    cannot fail, so no multi-encoding probe loop is needed.
+
+    Lines are sys.intern'd: both sides of a pair decode in the same worker
+    process, so equal lines become the same object and SequenceMatcher's
+    inner equality checks resolve on the pointer compare. Source files are
+    full of repeated brace/blank/include lines, so this also deduplicates
+    a good chunk of the decoded memory.
+    """
+    if data.startswith(b"\xef\xbb\xbf"):
+        data = data[3:]
+    return tuple(map(sys.intern, data.decode("utf-8", errors="replace").splitlines(keepends=True)))
+
+
+_NETWORK_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "sshfs", "fuse.sshfs", "9p", "afs",
+})
+
+
+def _is_network_path(path: str) -> bool:
+    """Best-effort check for a path on a network mount (SMB/NFS/…)."""
+    path = os.path.abspath(path)
+    if os.name == "nt":
+        import ctypes
+        if path.startswith("\\\\"):
+            return True  # UNC share
+        drive = os.path.splitdrive(path)[0] + "\\"
+        return ctypes.windll.kernel32.GetDriveTypeW(drive) == 4  # DRIVE_REMOTE
+    try:
+        best_mnt, best_type = "", ""
+        with open("/proc/mounts", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mnt, fstype = parts[1], parts[2]
+                if (path == mnt or path.startswith(mnt.rstrip("/") + "/")) \
+                        and len(mnt) > len(best_mnt):
+                    best_mnt, best_type = mnt, fstype
+        return best_type in _NETWORK_FS_TYPES
+    except OSError:
+        return False
+
+
+def collect_source_files(root: str, extensions: set, scan_workers: int = 8) -> dict:
+    """Map relative path -> (absolute path, size, mtime_ns) for files under root.
+
+    Directories are fanned out across a small thread pool: each worker pops a
+    directory off a shared queue, scandirs it (type and size come from the
+    cached DirEntry.stat, no extra syscall) and pushes subdirectories back.
+    The walk is I/O-bound, so threads overlap the latency of each readdir —
+    this matters most on network shares and cold spinning disks. Workers
+    collect matches into thread-local dicts merged once at the end; relative
+    paths are built incrementally instead of via os.path.relpath.
+    """
     root = os.path.abspath(root)
-    for dirpath, _, filenames in os.walk(root):
-        for fname in filenames:
-            ext = os.path.splitext(fname)[1].lower()
-            if ext in extensions or any(fname.lower().endswith(ce) for ce in COMPOUND_EXTENSIONS):
-                abs_path = os.path.join(dirpath, fname)
-                rel_path = os.path.relpath(abs_path, root)
-                result[rel_path] = abs_path
+    dirs = queue.SimpleQueue()
+    dirs.put((root, ""))
+    pending = 1  # directories queued or being scanned
+    lock = threading.Lock()
+    locals_ = []
+
+    def scan():
+        nonlocal pending
+        local = {}
+        locals_.append(local)
+        while True:
+            item = dirs.get()
+            if item is None:
+                return
+            dirpath, rel_dir = item
+            try:
+                with os.scandir(dirpath) as it:
+                    for entry in it:
+                        name = entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                with lock:
+                                    pending += 1
+                                dirs.put((entry.path, rel_dir + name + os.sep))
+                                continue
+                            if not entry.is_file():
+                                continue
+                            lower = name.lower()
+                            ext = "." + lower.rpartition(".")[2]
+                            if ext in extensions or lower.endswith(COMPOUND_EXTENSIONS):
+                                st = entry.stat()
+                                local[rel_dir + name] = (entry.path, st.st_size, st.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            with lock:
+                pending -= 1
+                if pending == 0:
+                    # Walk exhausted: wake every worker so they all exit.
+                    for _ in range(scan_workers):
+                        dirs.put(None)
+
+    with ThreadPoolExecutor(max_workers=scan_workers) as pool:
+        for fut in [pool.submit(scan) for _ in range(scan_workers)]:
+            fut.result()
+
+    result = {}
+    for local in locals_:
+        result.update(local)
     return result
 
 
-def compare_file(rel_path: str, path_a: str, path_b: str, context_lines: int = 3) -> Optional[FileDiff]:
-    exists_a = os.path.isfile(path_a)
-    exists_b = os.path.isfile(path_b)
+def _rapidfuzz_opcodes(lines_a: tuple, lines_b: tuple) -> list:
+    """Line-level diff via rapidfuzz's C++ Indel distance.
+
+    Indel is insert/delete only (git-style, Myers O(ND) bit-parallel), so its
+    opcodes map 1:1 onto unified-diff +/- lines with no replace handling.
+    """
+    return [
+        (op.tag, op.src_start, op.src_end, op.dest_start, op.dest_end)
+        for op in _Indel.opcodes(lines_a, lines_b)
+    ]
+
+
+def _dmp_opcodes(lines_a: tuple, lines_b: tuple) -> list:
+    """Line-level diff via diff-match-patch, as SequenceMatcher-style opcodes."""
+    dmp = _DiffMatchPatch()
+    dmp.Diff_Timeout = 0
+    chars_a, chars_b, _ = dmp.diff_linesToChars("".join(lines_a), "".join(lines_b))
+    opcodes = []
+    ia = ib = 0
+    for op, chunk in dmp.diff_main(chars_a, chars_b, False):
+        n = len(chunk)
+        if op == 0:
+            opcodes.append(("equal", ia, ia + n, ib, ib + n))
+            ia += n
+            ib += n
+        elif op == -1:
+            opcodes.append(("delete", ia, ia + n, ib, ib))
+            ia += n
+        else:
+            opcodes.append(("insert", ia, ia, ib, ib + n))
+            ib += n
+    return opcodes
+
+
+def _group_opcodes(opcodes: list, n: int):
+    """Split opcodes into hunk groups with n lines of context (difflib-style)."""
+    codes = list(opcodes)
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    nn = n + n
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = [(tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2)]
+            continue
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def _unified_from_opcodes(opcodes: list, lines_a: tuple, lines_b: tuple,
+                          fromfile: str, tofile: str, n: int):
+    """Render grouped opcodes in unified_diff format (same +/- line contract)."""
+    started = False
+    for group in _group_opcodes(opcodes, n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in lines_a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in lines_a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in lines_b[j1:j2]:
+                    yield "+" + line
+
+
+def compare_file(rel_path: str, path_a: str, path_b: str, context_lines: int = 3,
+                 size_a: int = -1, size_b: int = -1) -> Optional[FileDiff]:
+    # Sizes from the scan phase double as existence proof, so the common case
+    # needs no isfile stat here at all.
+    exists_a = size_a >= 0 or os.path.isfile(path_a)
+    exists_b = size_b >= 0 or os.path.isfile(path_b)
 
     if exists_a and exists_b:
-        if fast_hash(path_a) == fast_hash(path_b):
-            return None
-        lines_a = read_lines(path_a)
-        lines_b = read_lines(path_b)
-        diff_lines = list(difflib.unified_diff(
-            lines_a, lines_b,
-            fromfile=f"A/{rel_path}", tofile=f"B/{rel_path}",
-            n=context_lines,
-        ))
-        if not diff_lines:
+        # Equality is decided on the raw bytes — a C memcmp that bails on the
+        # first differing byte — so the identical majority of files is never
+        # decoded. Only differing files pay for decode + diff.
+        data_a = read_file_bytes(path_a)
+        data_b = read_file_bytes(path_b)
+        if data_a == data_b:
             return None
-        added = sum(1 for l in diff_lines if l.startswith("+") and not l.startswith("+++"))
-        removed = sum(1 for l in diff_lines if l.startswith("-") and not l.startswith("---"))
-        return FileDiff(
-            relative_path=rel_path, status="modified",
-            location_a=path_a, location_b=path_b,
-            lines_added=added, lines_removed=removed,
-            diff=[l.rstrip("\n") for l in diff_lines],
-        )
+        if _looks_binary(data_a) or _looks_binary(data_b):
+            return FileDiff(relative_path=rel_path, status="binary",
+                            location_a=path_a, location_b=path_b)
+        return _diff_task(rel_path, path_a, path_b, context_lines, data_a, data_b)
     elif exists_a and not exists_b:
         return FileDiff(relative_path=rel_path, status="removed", location_a=path_a, location_b=None)
     elif not exists_a and exists_b:
@@ -141,6 +459,53 @@ def compare_file(rel_path: str, path_a: str, path_b: str, context_lines: int = 3
     return None
 
 
+def _looks_binary(data: bytes) -> bool:
+    """NUL byte in the first 8KB — the classic cheap binary sniff."""
+    return b"\x00" in data[:8192]
+
+
+def _diff_task(rel_path: str, path_a: str, path_b: str, context_lines: int,
+               data_a: bytes, data_b: bytes) -> Optional[FileDiff]:
+    """CPU stage: decode and diff one differing pair (runs in a worker process)."""
+    lines_a = decode_lines(data_a)
+    lines_b = decode_lines(data_b)
+    if lines_a == lines_b:
+        return None
+    large = max(len(lines_a), len(lines_b)) > DMP_LINE_THRESHOLD
+    if large and (_Indel is not None or _DiffMatchPatch is not None):
+        # Fastest installed backend wins: rapidfuzz's C++ Indel, then
+        # diff-match-patch's line-mode diff, then stdlib difflib.
+        if _Indel is not None:
+            opcodes = _rapidfuzz_opcodes(lines_a, lines_b)
+        else:
+            opcodes = _dmp_opcodes(lines_a, lines_b)
+        diff_lines = list(_unified_from_opcodes(
+            opcodes, lines_a, lines_b,
+            f"A/{rel_path}", f"B/{rel_path}", context_lines,
+        ))
+    else:
+        diff_lines = list(difflib.unified_diff(
+            lines_a, lines_b,
+            fromfile=f"A/{rel_path}", tofile=f"B/{rel_path}",
+            n=context_lines,
+        ))
+    if not diff_lines:
+        return None
+    stripped = [l.rstrip("\n") for l in diff_lines]
+    # Count prefixes with two C-level scans of the joined text instead of
+    # a Python-level startswith call per diff line. The leading "\n" makes
+    # every line (including the first) start at a "\n" boundary.
+    blob = "\n" + "\n".join(stripped)
+    added = blob.count("\n+") - blob.count("\n+++")
+    removed = blob.count("\n-") - blob.count("\n---")
+    return FileDiff(
+        relative_path=rel_path, status="modified",
+        location_a=path_a, location_b=path_b,
+        lines_added=added, lines_removed=removed,
+        diff=stripped,
+    )
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # HTML REPORT BUILDER
 # ══════════════════════════════════════════════════════════════════════════════
@@ -149,31 +514,54 @@ def esc(text: str) -> str:
     return html_module.escape(text, quote=True)
 
 
-def build_html_report(report: dict) -> str:
+def _dumps(obj) -> str:
+    """Compact JSON string via orjson when installed (3-5x faster), stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _script_safe_json(obj) -> str:
+    """Compact JSON safe to embed in a <script> block.
+
+    Only "</" needs neutralizing (it is what terminates a script element);
+    "<\\/" is a legal JSON string escape, and a single str.replace does the
+    whole payload in one C-level pass.
+    """
+    return _dumps(obj).replace("</", "<\\/")
+
+
+def write_json_report(summary: dict, diffs: list, out) -> None:
+    """Stream the machine-readable JSON report entry by entry.
+
+    Serializing each FileDiff directly to the file avoids materializing a
+    full list of dicts plus json's output buffer for the whole document.
+    One entry per line keeps the output greppable without indent=2, which
+    triples the file size for deep diff arrays. Entries go through orjson
+    when it is installed, stdlib json otherwise.
+    """
+    out.write('{\n"summary": ')
+    if orjson is not None:
+        out.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2).decode("utf-8"))
+    else:
+        json.dump(summary, out, indent=2, ensure_ascii=False)
+    out.write(',\n"differences": [')
+    for i, d in enumerate(diffs):
+        out.write(",\n" if i else "\n")
+        out.write(_dumps(d.to_dict()))
+    out.write("\n]}\n")
+
+
+def write_html_report(report: dict, out) -> None:
+    """Stream the interactive HTML report to a writable text file.
+
+    Each file's diff row is written as it is serialized, so peak memory
+    stays at roughly one row instead of the whole multi-MB document.
+    """
     summary = report["summary"]
     diffs = report["differences"]
 
-    meta_list = []
-    diff_list = []
-    for d in diffs:
-        meta_list.append({
-            "r": d["relative_path"], "n": os.path.basename(d["relative_path"]),
-            "d": os.path.dirname(d["relative_path"]) or ".",
-            "s": d["status"], "la": d.get("lines_added", 0), "lr": d.get("lines_removed", 0),
-            "pa": d.get("location_a") or "", "pb": d.get("location_b") or "",
-        })
-        diff_list.append(d.get("diff", []))
-
-    meta_json = json.dumps(meta_list, ensure_ascii=False, separators=(",", ":"))
-    diff_json_str = json.dumps(diff_list, ensure_ascii=False, separators=(",", ":"))
-    diff_json_escaped = (diff_json_str
-        .replace("\\", "\\\\")
-        .replace("`", "\\`")
-        .replace("${", "\\${")
-        .replace("</script>", "<\\/script>")
-    )
-
-    return f"""<!DOCTYPE html>
+    out.write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
@@ -214,10 +602,8 @@ body{{font-family:var(--font-body);background:var(--bg-root);color:var(--text-pr
 .fbtn:hover{{border-color:var(--border-light);color:var(--text-primary)}}
 .fbtn.active{{background:var(--accent-blue);border-color:var(--accent-blue);color:#fff}}
 .result-count{{font-size:12px;color:var(--text-muted);font-family:var(--font-mono);margin-left:auto}}
-#loading{{padding:60px;text-align:center;color:var(--text-muted);font-family:var(--font-mono);font-size:14px}}
-#loading .spinner{{display:inline-block;width:20px;height:20px;border:2px solid var(--border);border-top-color:var(--accent-cyan);border-radius:50%;animation:spin .8s linear infinite;margin-right:12px;vertical-align:middle}}
-@keyframes spin{{to{{transform:rotate(360deg)}}}}
-.frow{{background:var(--bg-card);border:1px solid var(--border);border-radius:var(--radius);margin-bottom:5px;overflow:hidden}}
+#vscroll{{position:relative}}
+.frow{{position:absolute;left:0;right:0;background:var(--bg-card);border:1px solid var(--border);border-radius:var(--radius);overflow:hidden}}
 .frow:hover{{border-color:var(--border-light)}}
 .fhdr{{display:flex;justify-content:space-between;align-items:center;padding:13px 18px;cursor:pointer;user-select:none}}
 .fhdr:hover{{background:var(--bg-hover)}}
@@ -232,6 +618,8 @@ body{{font-family:var(--font-body);background:var(--bg-root);color:var(--text-pr
 .badge-modified{{background:rgba(79,163,232,.12);color:var(--badge-modified)}}
 .badge-added{{background:rgba(56,212,120,.12);color:var(--badge-added)}}
 .badge-removed{{background:rgba(232,80,80,.12);color:var(--badge-removed)}}
+.badge-binary{{background:rgba(136,146,166,.12);color:var(--text-secondary)}}
+.badge-large{{background:rgba(232,148,79,.12);color:#e8944f}}
 .chip{{font-size:12px;font-family:var(--font-mono);font-weight:600;padding:2px 8px;border-radius:5px}}
 .ca{{color:var(--diff-add-text);background:var(--diff-add-bg)}}.cr{{color:var(--diff-del-text);background:var(--diff-del-bg)}}
 .dpanel{{border-top:1px solid var(--border);display:none}}.dpanel.open{{display:block}}
@@ -261,7 +649,7 @@ body{{font-family:var(--font-body);background:var(--bg-root);color:var(--text-pr
     <div class="stat-card"><div class="stat-label">Lines Added</div><div class="stat-value green">{summary['total_lines_added']:,}</div></div>
     <div class="stat-card"><div class="stat-label">Lines Removed</div><div class="stat-value red">{summary['total_lines_removed']:,}</div></div>
   </div>
-  <div class="toolbar" id="toolbar" style="display:none">
+  <div class="toolbar" id="toolbar">
     <div class="search-box"><span class="search-icon">&#x2315;</span><input type="text" id="searchInput" placeholder="Search by file name or path… (Ctrl+K)"></div>
     <button class="fbtn active" onclick="setFilter('all',this)">All ({len(diffs):,})</button>
     <button class="fbtn" onclick="setFilter('modified',this)">Modified ({summary['files_modified']:,})</button>
@@ -270,37 +658,66 @@ body{{font-family:var(--font-body);background:var(--bg-root);color:var(--text-pr
     <button class="fbtn" onclick="collapseAll()">Collapse All</button>
     <span class="result-count" id="resultCount"></span>
   </div>
-  <div id="loading"><span class="spinner"></span>Parsing diff data…</div>
-  <div id="vscroll" style="display:none"></div>
+  <div id="vscroll"></div>
 </div>
-<script>const META={meta_json};</script>
-<script>let DIFFS=null;const _DIFF_RAW=`{diff_json_escaped}`;</script>
+<script type="application/x-ndjson" id="diffData">
+""")
+
+    meta_list = []
+    for idx, d in enumerate(diffs):
+        meta_list.append({
+            "r": d["relative_path"], "n": os.path.basename(d["relative_path"]),
+            "d": os.path.dirname(d["relative_path"]) or ".",
+            "s": d["status"], "la": d.get("lines_added", 0), "lr": d.get("lines_removed", 0),
+            "pa": d.get("location_a") or "", "pb": d.get("location_b") or "",
+        })
+        # Sparse payload: added/removed files have no hunks, so they get no
+        # row at all instead of a placeholder empty list each.
+        hunks = d.get("diff")
+        if hunks:
+            out.write(f"{idx}\t")
+            out.write(_script_safe_json(hunks))
+            out.write("\n")
+
+    out.write(f"""</script>
+<script type="application/json" id="metaData">{_script_safe_json(meta_list)}</script>
 <script>
 (function(){{
+const META=JSON.parse(document.getElementById('metaData').textContent);
 const searchInput=document.getElementById('searchInput'),vscroll=document.getElementById('vscroll'),
-loadingEl=document.getElementById('loading'),toolbarEl=document.getElementById('toolbar'),
 resultCountEl=document.getElementById('resultCount');
 const PATHS_LOWER=META.map(m=>m.r.toLowerCase()),N=META.length;
+let DIFF_LINES=null;const DIFF_CACHE=[];
 let filtered=[],activeFilter='all',searchQuery='',expandedSet=new Set();
-function init(){{setTimeout(()=>{{try{{DIFFS=JSON.parse(_DIFF_RAW)}}catch(e){{console.error(e);DIFFS=new Array(N).fill([])}};loadingEl.style.display='none';toolbarEl.style.display='flex';vscroll.style.display='block';refilter()}},50)}}
-function refilter(){{const q=searchQuery,f=activeFilter;filtered=[];for(let i=0;i<N;i++){{if(f!=='all'&&META[i].s!==f)continue;if(q&&!PATHS_LOWER[i].includes(q))continue;filtered.push(i)}};expandedSet.clear();resultCountEl.textContent=filtered.length.toLocaleString()+' files';renderList()}}
+function init(){{const raw=document.getElementById('diffData').textContent.trim();DIFF_LINES=Object.create(null);if(raw)for(const line of raw.split('\\n')){{const t=line.indexOf('\\t');DIFF_LINES[line.slice(0,t)]=line.slice(t+1)}};refilter()}}
+function refilter(){{const q=searchQuery,f=activeFilter;filtered=[];for(let i=0;i<N;i++){{const s=META[i].s;if(f!=='all'&&s!==f&&!(f==='modified'&&(s==='binary'||s==='large')))continue;if(q&&!PATHS_LOWER[i].includes(q))continue;filtered.push(i)}};expandedSet.clear();resultCountEl.textContent=filtered.length.toLocaleString()+' files';renderList()}}
 window.refilter=refilter;
 let sTimer=null;searchInput.addEventListener('input',e=>{{clearTimeout(sTimer);sTimer=setTimeout(()=>{{searchQuery=e.target.value.toLowerCase().trim();refilter()}},100)}});
 window.setFilter=function(f,btn){{activeFilter=f;document.querySelectorAll('.fbtn').forEach(b=>b.classList.remove('active'));btn.classList.add('active');refilter()}};
-window.collapseAll=function(){{expandedSet.clear();vscroll.querySelectorAll('.dpanel.open').forEach(p=>p.classList.remove('open'));vscroll.querySelectorAll('.arrow.open').forEach(a=>a.classList.remove('open'))}};
+window.collapseAll=function(){{expandedSet.clear();DIFF_CACHE.length=0;vscroll.querySelectorAll('.dpanel.open').forEach(p=>{{p.classList.remove('open');p.innerHTML='';delete p.dataset.loaded}});vscroll.querySelectorAll('.arrow.open').forEach(a=>a.classList.remove('open'));if(heights.length){{heights.fill(ROW_H);rebuildOffsets();repositionAll()}}}};
 function esc(s){{const d=document.createElement('div');d.textContent=s;return d.innerHTML}}
-function buildDiff(idx){{if(!DIFFS)return'<div style="padding:20px;color:#555f73;text-align:center">Loading…</div>';const lines=DIFFS[idx];if(!lines||!lines.length)return'<div style="padding:20px;color:#555f73;text-align:center;font-style:italic">No diff content (file added or removed)</div>';const buf=['<div class="dblock"><pre><code>'];for(let i=0;i<lines.length;i++){{const l=lines[i],c=l.charCodeAt(0);let cls;if(c===43)cls=(l.charCodeAt(1)===43&&l.charCodeAt(2)===43)?'dhd':'da';else if(c===45)cls=(l.charCodeAt(1)===45&&l.charCodeAt(2)===45)?'dhd':'dd';else if(c===64)cls='dh';else cls='dc';buf.push('<span class="'+cls+'">'+esc(l)+'</span>')}};buf.push('</code></pre></div>');return buf.join('')}}
-const PAGE_SIZE=100;let renderedCount=0,sentinel=null,observer=null;
-function renderList(){{vscroll.innerHTML='';renderedCount=0;if(!filtered.length){{vscroll.innerHTML='<div style="padding:40px;text-align:center;color:#555f73">No matching files.</div>';return}};renderNextPage();setupObserver()}}
-function renderNextPage(){{const end=Math.min(renderedCount+PAGE_SIZE,filtered.length),frag=document.createDocumentFragment();for(let vi=renderedCount;vi<end;vi++){{const di=filtered[vi];frag.appendChild(createRow(di,META[di]))}};if(sentinel&&sentinel.parentNode)sentinel.parentNode.removeChild(sentinel);vscroll.appendChild(frag);renderedCount=end;if(renderedCount<filtered.length){{sentinel=document.createElement('div');sentinel.style.height='1px';vscroll.appendChild(sentinel);if(observer)observer.observe(sentinel)}}}}
-function setupObserver(){{if(observer)observer.disconnect();observer=new IntersectionObserver(entries=>{{if(entries[0].isIntersecting&&renderedCount<filtered.length)renderNextPage()}},{{rootMargin:'800px'}});if(sentinel)observer.observe(sentinel)}}
-function createRow(di,m){{const row=document.createElement('div');row.className='frow';const chips=m.s==='modified'?`<span class="chip ca">+${{m.la.toLocaleString()}}</span><span class="chip cr">\\u2212${{m.lr.toLocaleString()}}</span>`:'';row.innerHTML=`<div class="fhdr"><div class="fmeta"><span class="badge badge-${{m.s}}">${{m.s.toUpperCase()}}</span><div class="fnb"><span class="fname">${{esc(m.n)}}</span><span class="fdir">${{esc(m.d)}}</span></div></div><div class="fstats">${{chips}}<span class="arrow">&#x25B8;</span></div></div><div class="dpanel" data-di="${{di}}"></div>`;const hdr=row.querySelector('.fhdr'),panel=row.querySelector('.dpanel'),arrow=row.querySelector('.arrow');hdr.addEventListener('click',()=>{{const isOpen=panel.classList.contains('open');if(isOpen){{panel.classList.remove('open');arrow.classList.remove('open');expandedSet.delete(di)}}else{{if(!panel.dataset.loaded){{const locA=m.pa?`<span><b>A:</b> ${{esc(m.pa)}}</span>`:'',locB=m.pb?`<span><b>B:</b> ${{esc(m.pb)}}</span>`:'';panel.innerHTML=`<div class="flocs">${{locA}}${{locB}}</div>${{buildDiff(di)}}`;panel.dataset.loaded='1'}};panel.classList.add('open');arrow.classList.add('open');expandedSet.add(di)}}}});return row}}
+function buildDiff(idx){{let lines=DIFF_CACHE[idx];if(lines===undefined){{const raw=DIFF_LINES[idx];try{{lines=raw?JSON.parse(raw):[]}}catch(e){{console.error(e);lines=[]}};DIFF_CACHE[idx]=lines}};if(!lines||!lines.length)return'<div style="padding:20px;color:#555f73;text-align:center;font-style:italic">No diff content for this entry</div>';const buf=['<div class="dblock"><pre><code>'];for(let i=0;i<lines.length;i++){{const l=lines[i],c=l.charCodeAt(0);let cls;if(c===43)cls=(l.charCodeAt(1)===43&&l.charCodeAt(2)===43)?'dhd':'da';else if(c===45)cls=(l.charCodeAt(1)===45&&l.charCodeAt(2)===45)?'dhd':'dd';else if(c===64)cls='dh';else cls='dc';buf.push('<span class="'+cls+'">'+esc(l)+'</span>')}};buf.push('</code></pre></div>');return buf.join('')}}
+// Windowed virtualization: only rows inside the viewport (plus overscan)
+// exist in the DOM. heights[] tracks per-row pixel heights (expanded rows
+// differ), offsets[] is its prefix sum, and a binary search finds the
+// first visible row on scroll.
+const OVERSCAN=8;const ROW_GAP=5;let ROW_H=0,heights=[],offsets=[],rendered=new Map();
+function rebuildOffsets(){{let y=0;offsets.length=filtered.length;for(let i=0;i<filtered.length;i++){{offsets[i]=y;y+=heights[i]}};vscroll.style.height=y+'px'}}
+function repositionAll(){{for(const[vi,el]of rendered)el.style.top=offsets[vi]+'px'}}
+function measureRow(vi,el){{const h=el.offsetHeight+ROW_GAP;if(h>ROW_GAP&&h!==heights[vi]){{heights[vi]=h;rebuildOffsets();repositionAll()}}}}
+function firstVisible(top){{let lo=0,hi=filtered.length-1,ans=0;while(lo<=hi){{const mid=(lo+hi)>>1;if(offsets[mid]<=top){{ans=mid;lo=mid+1}}else hi=mid-1}};return ans}}
+function renderList(){{for(const el of rendered.values())el.remove();rendered.clear();vscroll.innerHTML='';vscroll.style.height='';if(!filtered.length){{vscroll.innerHTML='<div style="padding:40px;text-align:center;color:#555f73">No matching files.</div>';return}};if(!ROW_H){{const probe=createRow(filtered[0],META[filtered[0]],0);probe.style.visibility='hidden';vscroll.appendChild(probe);ROW_H=(probe.offsetHeight||47)+ROW_GAP;probe.remove()}};heights=new Array(filtered.length).fill(ROW_H);rebuildOffsets();updateWindow()}}
+function updateWindow(){{if(!filtered.length||!offsets.length)return;const baseY=vscroll.getBoundingClientRect().top+window.scrollY;const viewTop=Math.max(0,window.scrollY-baseY),viewBot=window.scrollY-baseY+window.innerHeight;let s=Math.max(0,firstVisible(viewTop)-OVERSCAN),e=Math.min(filtered.length,firstVisible(viewBot)+1+OVERSCAN);for(const[vi,el]of rendered)if(vi<s||vi>=e){{el.remove();rendered.delete(vi)}};const frag=document.createDocumentFragment();let added=false;for(let vi=s;vi<e;vi++){{if(rendered.has(vi))continue;const di=filtered[vi],el=createRow(di,META[di],vi);el.style.top=offsets[vi]+'px';rendered.set(vi,el);frag.appendChild(el);added=true}};if(added)vscroll.appendChild(frag);for(const[vi,el]of rendered){{el.style.top=offsets[vi]+'px';if(expandedSet.has(filtered[vi])&&heights[vi]===ROW_H)measureRow(vi,el)}}}}
+window.addEventListener('scroll',()=>requestAnimationFrame(updateWindow),{{passive:true}});
+window.addEventListener('resize',()=>requestAnimationFrame(updateWindow),{{passive:true}});
+function openPanel(panel,arrow,di,m){{if(!panel.dataset.loaded){{const locA=m.pa?`<span><b>A:</b> ${{esc(m.pa)}}</span>`:'',locB=m.pb?`<span><b>B:</b> ${{esc(m.pb)}}</span>`:'';panel.innerHTML=`<div class="flocs">${{locA}}${{locB}}</div>${{buildDiff(di)}}`;panel.dataset.loaded='1'}};panel.classList.add('open');arrow.classList.add('open')}}
+function createRow(di,m,vi){{const row=document.createElement('div');row.className='frow';const chips=m.s==='modified'?`<span class="chip ca">+${{m.la.toLocaleString()}}</span><span class="chip cr">\\u2212${{m.lr.toLocaleString()}}</span>`:'';row.innerHTML=`<div class="fhdr"><div class="fmeta"><span class="badge badge-${{m.s}}">${{m.s.toUpperCase()}}</span><div class="fnb"><span class="fname">${{esc(m.n)}}</span><span class="fdir">${{esc(m.d)}}</span></div></div><div class="fstats">${{chips}}<span class="arrow">&#x25B8;</span></div></div><div class="dpanel" data-di="${{di}}"></div>`;const hdr=row.querySelector('.fhdr'),panel=row.querySelector('.dpanel'),arrow=row.querySelector('.arrow');if(expandedSet.has(di))openPanel(panel,arrow,di,m);hdr.addEventListener('click',()=>{{const isOpen=panel.classList.contains('open');if(isOpen){{panel.classList.remove('open');arrow.classList.remove('open');expandedSet.delete(di);panel.innerHTML='';delete panel.dataset.loaded;delete DIFF_CACHE[di]}}else{{openPanel(panel,arrow,di,m);expandedSet.add(di)}};measureRow(vi,row)}});return row}}
 document.addEventListener('keydown',e=>{{if((e.metaKey||e.ctrlKey)&&e.key==='k'){{e.preventDefault();searchInput.focus()}}}});
 init();
 }})();
 </script>
 </body>
-</html>"""
+</html>""")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -319,14 +736,20 @@ class UESourceDiffApp:
         self.engine_a_path = tk.StringVar()
         self.engine_b_path = tk.StringVar()
         self.output_dir = tk.StringVar(value=str(Path.home() / "Desktop"))
-        self.thread_count = tk.IntVar(value=os.cpu_count() or 8)
+        self.thread_count = tk.IntVar(value=os.cpu_count() or 4)
         self.context_lines = tk.IntVar(value=3)
+        self.max_file_mb = tk.IntVar(value=8)
         self.is_running = False
         self.should_cancel = False
         self.last_report_path = None
 
+        # UI updates from the worker thread are enqueued here and drained in
+        # batches on the Tk main loop — see _drain_ui_queue.
+        self._ui_q = queue.SimpleQueue()
+
         self._setup_styles()
         self._build_ui()
+        self.root.after(50, self._drain_ui_queue)
 
     # ─── Styles ───────────────────────────────────────────────────────────
 
@@ -416,6 +839,18 @@ class UESourceDiffApp:
         )
         ctx_spin.pack(anchor="w", pady=(2, 0))
 
+        # Max file size
+        mf = ttk.Frame(settings_frame)
+        mf.pack(side=tk.LEFT, padx=(0, 24))
+        ttk.Label(mf, text="Max File MB", style="Sub.TLabel").pack(anchor="w")
+        max_spin = tk.Spinbox(
+            mf, from_=1, to=1024, textvariable=self.max_file_mb, width=6,
+            bg=c["card"], fg=c["text"], insertbackground=c["text"],
+            highlightthickness=0, buttonbackground=c["surface"],
+            font=("Consolas", 11), relief="flat",
+        )
+        max_spin.pack(anchor="w", pady=(2, 0))
+
         # ── Buttons ──
         btn_frame = ttk.Frame(main)
         btn_frame.pack(fill=tk.X, pady=(24, 0))
@@ -514,24 +949,72 @@ class UESourceDiffApp:
             var.set(path)
 
     # ─── Logging ──────────────────────────────────────────────────────────
+    # These are safe to call from any thread: they only enqueue. A single
+    # periodic after() tick applies everything in one batch, coalescing
+    # status/file/progress to the latest value so the worker thread never
+    # floods the Tk event loop with per-file callbacks.
 
     def _log(self, message: str, tag: str = "info"):
-        self.log_text.configure(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + "\n", tag)
-        self.log_text.see(tk.END)
-        self.log_text.configure(state=tk.DISABLED)
+        self._ui_q.put(("log", (message, tag)))
 
     def _set_status(self, text: str):
-        self.status_label.configure(text=text)
+        self._ui_q.put(("status", text))
 
     def _set_file(self, text: str):
-        display = text
-        if len(display) > 100:
-            display = "…" + display[-97:]
-        self.file_label.configure(text=display)
+        self._ui_q.put(("file", text))
 
     def _set_progress(self, value: float):
-        self.progress_bar["value"] = value
+        self._ui_q.put(("progress", value))
+
+    def _drain_ui_queue(self):
+        log_lines = []
+        latest = {}
+        while True:
+            try:
+                kind, payload = self._ui_q.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "log":
+                log_lines.append(payload)
+            else:
+                latest[kind] = payload
+        if log_lines:
+            self.log_text.configure(state=tk.NORMAL)
+            # One insert per run of same-tag lines: ordering is preserved but
+            # thousands of per-line inserts collapse into a handful of calls.
+            run, run_tag = [], log_lines[0][1]
+            for message, tag in log_lines:
+                if tag != run_tag:
+                    self.log_text.insert(tk.END, "\n".join(run) + "\n", run_tag)
+                    run, run_tag = [], tag
+                run.append(message)
+            self.log_text.insert(tk.END, "\n".join(run) + "\n", run_tag)
+            # Unbounded Text widgets make Tk crawl; trim the oldest lines.
+            if int(self.log_text.index("end-1c").split(".")[0]) > 50000:
+                self.log_text.delete("1.0", "5000.0")
+            self.log_text.see(tk.END)
+            self.log_text.configure(state=tk.DISABLED)
+        if "compare" in latest:
+            # Raw counters from the compare loop; the format work (":," adds
+            # several temporaries per call) happens once per tick, here on
+            # the main thread, not once per file on the worker.
+            p, total, start = latest["compare"]
+            elapsed = time.time() - start
+            rate = p / elapsed if elapsed > 0 else 0
+            pct = (p / total) * 100
+            self.progress_bar["value"] = pct
+            self.status_label.configure(
+                text=f"Comparing {p:,}/{total:,} files  •  {rate:.0f} files/s  •  {pct:.1f}%")
+        if "status" in latest:
+            self.status_label.configure(text=latest["status"])
+        if "file" in latest:
+            display = latest["file"]
+            if len(display) > 100:
+                display = "…" + display[-97:]
+            self.file_label.configure(text=display)
+        if "progress" in latest:
+            self.progress_bar["value"] = latest["progress"]
+        self.root.after(50, self._drain_ui_queue)
 
     # ─── Comparison logic ─────────────────────────────────────────────────
 
@@ -580,8 +1063,8 @@ class UESourceDiffApp:
         try:
             self._comparison_worker(engine_a, engine_b, output_dir)
         except Exception as e:
-            self.root.after(0, lambda: self._log(f"ERROR: {e}", "error"))
-            self.root.after(0, lambda: self._set_status(f"Failed: {e}"))
+            self._log(f"ERROR: {e}", "error")
+            self._set_status(f"Failed: {e}")
         finally:
             self.root.after(0, self._finish)
 
@@ -597,132 +1080,267 @@ class UESourceDiffApp:
         eb = os.path.abspath(engine_b)
         threads = self.thread_count.get()
         ctx = self.context_lines.get()
-        extensions = DEFAULT_EXTENSIONS.copy()
+        max_bytes = self.max_file_mb.get() * 1024 * 1024
 
-        self.root.after(0, lambda: self._log(f"Engine A : {ea}"))
-        self.root.after(0, lambda: self._log(f"Engine B : {eb}"))
-        self.root.after(0, lambda: self._log(f"Threads  : {threads}"))
-        self.root.after(0, lambda: self._log(f"Context  : {ctx} lines"))
-        self.root.after(0, lambda: self._log(""))
+        self._log(f"Engine A : {ea}")
+        self._log(f"Engine B : {eb}")
+        self._log(f"Threads  : {threads}")
+        self._log(f"Context  : {ctx} lines")
+        self._log("")
 
         # ── Scan ──
-        self.root.after(0, lambda: self._set_status("Scanning Engine A…"))
-        self.root.after(0, lambda: self._log("Scanning Engine A…", "muted"))
-        files_a = collect_source_files(ea, extensions)
-        self.root.after(0, lambda: self._log(f"  → {len(files_a):,} files found", "muted"))
+        self._set_status("Scanning engine sources…")
+        self._log("Scanning Engine A and Engine B…", "muted")
+        # Network shares thrash under a wide parallel readdir; clamp the
+        # per-engine scan fan-out when either tree lives on one.
+        if _is_network_path(ea) or _is_network_path(eb):
+            scan_workers = 4
+            self._log("Network mount detected — scan concurrency clamped to 4", "muted")
+        else:
+            scan_workers = 8
+        with ThreadPoolExecutor(max_workers=2) as scan_pool:
+            fut_a = scan_pool.submit(collect_source_files, ea, DEFAULT_EXTENSIONS, scan_workers)
+            fut_b = scan_pool.submit(collect_source_files, eb, DEFAULT_EXTENSIONS, scan_workers)
+            files_a = fut_a.result()
+            files_b = fut_b.result()
+        self._log(f"  → Engine A: {len(files_a):,} files found", "muted")
+        self._log(f"  → Engine B: {len(files_b):,} files found", "muted")
 
         if self.should_cancel:
-            self.root.after(0, lambda: self._log("Cancelled.", "warn"))
+            self._log("Cancelled.", "warn")
             return
 
-        self.root.after(0, lambda: self._set_status("Scanning Engine B…"))
-        self.root.after(0, lambda: self._log("Scanning Engine B…", "muted"))
-        files_b = collect_source_files(eb, extensions)
-        self.root.after(0, lambda: self._log(f"  → {len(files_b):,} files found", "muted"))
-
-        all_paths = sorted(set(files_a.keys()) | set(files_b.keys()))
+        # Largest-first (LPT) scheduling: the biggest files start immediately
+        # and small ones fill the tail, so one huge .cpp landing last cannot
+        # stall the whole run. Report order is restored by the final sort on
+        # relative_path.
+        # dict_keys views are set-like, so one union allocates the combined
+        # set directly — no per-dict set copies first.
+        all_paths = sorted(
+            files_a.keys() | files_b.keys(),
+            key=lambda rp: max(files_a.get(rp, (None, -1))[1], files_b.get(rp, (None, -1))[1]),
+            reverse=True,
+        )
         total = len(all_paths)
-        self.root.after(0, lambda: self._log(f"\nTotal unique paths: {total:,}\n"))
+        self._log(f"\nTotal unique paths: {total:,}\n")
 
         if total == 0:
-            self.root.after(0, lambda: self._log("No source files found. Check your paths.", "warn"))
+            self._log("No source files found. Check your paths.", "warn")
             return
 
         # ── Compare ──
-        self.root.after(0, lambda: self._set_status(f"Comparing 0/{total:,} files…"))
+        self._set_status(f"Comparing 0/{total:,} files…")
         diffs = []
-        diffs_lock = threading.Lock()
-        processed = [0]
+        cache_rows = []
+        processed = 0
         start_time = time.time()
+        hash_cache = load_hash_cache()
+        result_rows = []
+        results_lock = threading.Lock()
+        try:
+            results_con = _cache_connect(check_same_thread=False)
+        except sqlite3.Error:
+            results_con = None
+
+        def cached_digest(abs_path, size, mtime_ns):
+            cached = hash_cache.get(abs_path)
+            if cached and cached[0] == mtime_ns and cached[1] == size:
+                return cached[2]
+            return None
 
-        def update_ui(rel_path):
-            processed[0] += 1
-            p = processed[0]
-            if p % 50 == 0 or p == total:  # throttle UI updates
-                pct = (p / total) * 100
-                elapsed = time.time() - start_time
-                rate = p / elapsed if elapsed > 0 else 0
-                self.root.after(0, lambda: self._set_progress(pct))
-                self.root.after(0, lambda: self._set_status(
-                    f"Comparing {p:,}/{total:,} files  •  {rate:.0f} files/s  •  {pct:.1f}%"
-                ))
-                self.root.after(0, lambda: self._set_file(rel_path))
-
-        def worker(rel_path):
-            if self.should_cancel:
-                return
-            path_a = files_a.get(rel_path, os.path.join(ea, rel_path))
-            path_b = files_b.get(rel_path, os.path.join(eb, rel_path))
-            result = compare_file(rel_path, path_a, path_b, ctx)
-            update_ui(rel_path)
-            if result:
-                with diffs_lock:
-                    diffs.append(result)
-
-        with ThreadPoolExecutor(max_workers=threads) as pool:
-            futures = [pool.submit(worker, rp) for rp in all_paths]
-            for f in as_completed(futures):
+        def task_args(files_a_get=files_a.get, files_b_get=files_b.get,
+                      join=os.path.join):
+            # Bound methods hoisted to default args: LOAD_FAST instead of a
+            # LOAD_DEREF + attribute lookup per file in this 100k-iteration loop.
+            for rel_path in all_paths:
+                entry_a = files_a_get(rel_path)
+                entry_b = files_b_get(rel_path)
+                path_a = entry_a[0] if entry_a else join(ea, rel_path)
+                path_b = entry_b[0] if entry_b else join(eb, rel_path)
+                yield (
+                    rel_path, path_a, path_b, ctx,
+                    entry_a[1] if entry_a else -1,
+                    entry_b[1] if entry_b else -1,
+                    entry_a[2] if entry_a else 0,
+                    entry_b[2] if entry_b else 0,
+                    cached_digest(path_a, entry_a[1], entry_a[2]) if entry_a else None,
+                    cached_digest(path_b, entry_b[1], entry_b[2]) if entry_b else None,
+                )
+
+        # Two-stage pipeline: a thread pool does the I/O-bound work (reads,
+        # digests, byte equality — all GIL-releasing C) while a process pool
+        # runs the CPU-bound decode+diff for the pairs that actually differ.
+        # Disks stay saturated while the CPUs diff; identical files never
+        # cross the process boundary at all. The semaphore bounds how many
+        # differing pairs' bytes sit pickled in flight.
+        io_workers = min(32, 4 * (os.cpu_count() or 8))
+        inflight = threading.BoundedSemaphore(2 * threads)
+        pending = []
+
+        # PyInstaller builds relaunch the whole bundled exe per spawned
+        # worker, which costs more than the GIL does; diff in threads there.
+        if getattr(sys, "frozen", False):
+            cpu_pool_cls = ThreadPoolExecutor
+        else:
+            cpu_pool_cls = ProcessPoolExecutor
+
+        with cpu_pool_cls(max_workers=threads) as cpu_pool, \
+             ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+
+            def stage_io(task, _max_bytes=max_bytes, _read=_read_bytes_cached,
+                         _blake2b=hashlib.blake2b, _diff=FileDiff):
+                (rel_path, path_a, path_b, ctx_, size_a, size_b,
+                 mtime_a, mtime_b, digest_a, digest_b) = task
+                rows = []
+                if size_a < 0 or size_b < 0:
+                    # Added/removed: no content work, resolve right here.
+                    return compare_file(rel_path, path_a, path_b, ctx_, size_a, size_b), rows, None
+                if size_a > _max_bytes or size_b > _max_bytes:
+                    # Oversized files get a size-only comparison; never read
+                    # (or diff) hundreds of MB the user won't scroll through.
+                    if size_a == size_b:
+                        return None, rows, None
+                    return _diff(relative_path=rel_path, status="large",
+                                    location_a=path_a, location_b=path_b), rows, None
+                key = (rel_path, mtime_a, size_a, mtime_b, size_b, ctx_)
+                if results_con is not None:
+                    # Re-runs of the same pair (e.g. after tweaking context
+                    # lines, which is part of the key) reuse the stored diff
+                    # without even reading the files.
+                    with results_lock:
+                        hit, cached = load_diff_result(results_con, key)
+                    if hit:
+                        return cached, rows, None
+                # Scan stats are passed straight through, skipping the stat
+                # that read_file_bytes would otherwise redo per read.
+                if digest_a is None:
+                    digest_a = _blake2b(
+                        _read(path_a, mtime_a, size_a), digest_size=16).hexdigest()
+                    rows.append((path_a, mtime_a, size_a, digest_a))
+                if digest_b is None:
+                    digest_b = _blake2b(
+                        _read(path_b, mtime_b, size_b), digest_size=16).hexdigest()
+                    rows.append((path_b, mtime_b, size_b, digest_b))
+                if digest_a == digest_b:
+                    return None, rows, None
+                data_a = _read(path_a, mtime_a, size_a)
+                data_b = _read(path_b, mtime_b, size_b)
+                if data_a == data_b or self.should_cancel:
+                    return None, rows, None
+                if _looks_binary(data_a) or _looks_binary(data_b):
+                    return _diff(relative_path=rel_path, status="binary",
+                                    location_a=path_a, location_b=path_b), rows, None
+                inflight.acquire()
+                try:
+                    fut = cpu_pool.submit(_diff_task, rel_path, path_a, path_b, ctx_, data_a, data_b)
+                except BaseException:
+                    inflight.release()
+                    raise
+                fut.add_done_callback(lambda _f: inflight.release())
+                return None, rows, (key, fut)
+
+            for rel_path, (result, new_rows, fut) in zip(all_paths, io_pool.map(stage_io, task_args())):
                 if self.should_cancel:
-                    pool.shutdown(wait=False, cancel_futures=True)
                     break
-                f.result()
+                if new_rows:
+                    cache_rows.extend(new_rows)
+                if fut is not None:
+                    pending.append(fut)
+                processed += 1
+                # Raw counters only — the drainer coalesces to the latest
+                # value per tick and does all the string formatting there.
+                self._ui_q.put(("compare", (processed, total, start_time)))
+                self._set_file(rel_path)
+                if result:
+                    diffs.append(result)
+
+            if self.should_cancel:
+                for _key, fut in pending:
+                    fut.cancel()
+            else:
+                self._set_status("Collecting diff results…")
+                for key, fut in pending:
+                    result = fut.result()
+                    result_rows.append(key + (pickle.dumps(result),))
+                    if result:
+                        diffs.append(result)
+
+        if results_con is not None:
+            results_con.close()
 
         if self.should_cancel:
-            self.root.after(0, lambda: self._log("Comparison cancelled by user.", "warn"))
-            self.root.after(0, lambda: self._set_status("Cancelled"))
+            self._log("Comparison cancelled by user.", "warn")
+            self._set_status("Cancelled")
             return
 
         elapsed = time.time() - start_time
-        self.root.after(0, lambda: self._set_progress(100))
-        self.root.after(0, lambda: self._log(f"Comparison complete in {elapsed:.1f}s", "success"))
+        self._set_progress(100)
+        self._log(f"Comparison complete in {elapsed:.1f}s", "success")
+
+        if cache_rows:
+            store_hash_cache(cache_rows)
+            self._log(f"Hash cache updated ({len(cache_rows):,} entries)", "muted")
+        if result_rows:
+            store_diff_results(result_rows)
+            self._log(f"Diff cache updated ({len(result_rows):,} entries)", "muted")
 
         # ── Sort and build report ──
         diffs.sort(key=lambda d: d.relative_path)
 
+        # One pass over diffs instead of six generator sweeps.
+        n_modified = n_added = n_removed = lines_added = lines_removed = 0
+        for d in diffs:
+            if d.status == "added":
+                n_added += 1
+            elif d.status == "removed":
+                n_removed += 1
+            else:  # modified / binary / large
+                n_modified += 1
+            lines_added += d.lines_added
+            lines_removed += d.lines_removed
+
         summary = {
             "engine_a": ea, "engine_b": eb,
             "total_files_scanned": total,
-            "files_modified": sum(1 for d in diffs if d.status == "modified"),
-            "files_added": sum(1 for d in diffs if d.status == "added"),
-            "files_removed": sum(1 for d in diffs if d.status == "removed"),
-            "total_lines_added": sum(d.lines_added for d in diffs),
-            "total_lines_removed": sum(d.lines_removed for d in diffs),
+            "files_modified": n_modified,
+            "files_added": n_added,
+            "files_removed": n_removed,
+            "total_lines_added": lines_added,
+            "total_lines_removed": lines_removed,
         }
 
-        report = {"summary": summary, "differences": [asdict(d) for d in diffs]}
-
         # ── Save JSON ──
-        self.root.after(0, lambda: self._set_status("Saving JSON report…"))
+        self._set_status("Saving JSON report…")
         json_path = os.path.join(output_dir, "ue_diff_report.json")
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        with open(json_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            write_json_report(summary, diffs, f)
         json_mb = os.path.getsize(json_path) / (1024 * 1024)
-        self.root.after(0, lambda: self._log(f"JSON saved: {json_path} ({json_mb:.1f} MB)", "muted"))
+        self._log(f"JSON saved: {json_path} ({json_mb:.1f} MB)", "muted")
 
         # ── Build HTML ──
-        self.root.after(0, lambda: self._set_status("Building HTML report…"))
-        self.root.after(0, lambda: self._log("Building HTML report…", "muted"))
-        html_content = build_html_report(report)
+        self._set_status("Building HTML report…")
+        self._log("Building HTML report…", "muted")
+        report = {"summary": summary, "differences": [d.to_dict() for d in diffs]}
         html_path = os.path.join(output_dir, "ue_diff_report.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        with open(html_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            write_html_report(report, f)
         html_mb = os.path.getsize(html_path) / (1024 * 1024)
-        self.root.after(0, lambda: self._log(f"HTML saved: {html_path} ({html_mb:.1f} MB)", "muted"))
+        self._log(f"HTML saved: {html_path} ({html_mb:.1f} MB)", "muted")
 
         self.last_report_path = html_path
 
         # ── Summary ──
-        self.root.after(0, lambda: self._log(""))
-        self.root.after(0, lambda: self._log("══════════════════════════════════════", "success"))
-        self.root.after(0, lambda: self._log(f"  Files scanned : {summary['total_files_scanned']:>10,}", "success"))
-        self.root.after(0, lambda: self._log(f"  Modified      : {summary['files_modified']:>10,}", "success"))
-        self.root.after(0, lambda: self._log(f"  Added         : {summary['files_added']:>10,}", "success"))
-        self.root.after(0, lambda: self._log(f"  Removed       : {summary['files_removed']:>10,}", "success"))
-        self.root.after(0, lambda: self._log(f"  Lines added   : {summary['total_lines_added']:>10,}", "success"))
-        self.root.after(0, lambda: self._log(f"  Lines removed : {summary['total_lines_removed']:>10,}", "success"))
-        self.root.after(0, lambda: self._log("══════════════════════════════════════", "success"))
-        self.root.after(0, lambda: self._set_status("Done — click 'Open Report' to view results"))
-        self.root.after(0, lambda: self._set_file(""))
+        self._log("")
+        self._log("══════════════════════════════════════", "success")
+        self._log(f"  Files scanned : {summary['total_files_scanned']:>10,}", "success")
+        self._log(f"  Modified      : {summary['files_modified']:>10,}", "success")
+        self._log(f"  Added         : {summary['files_added']:>10,}", "success")
+        self._log(f"  Removed       : {summary['files_removed']:>10,}", "success")
+        self._log(f"  Lines added   : {summary['total_lines_added']:>10,}", "success")
+        self._log(f"  Lines removed : {summary['total_lines_removed']:>10,}", "success")
+        self._log("══════════════════════════════════════", "success")
+        self._set_status("Done — click 'Open Report' to view results")
+        self._set_file("")
 
     # ─── Open report ──────────────────────────────────────────────────────
 
@@ -756,4 +1374,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for ProcessPoolExecutor inside a PyInstaller-frozen exe
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file